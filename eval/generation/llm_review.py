@@ -20,6 +20,9 @@ from .prompts import build_bulk_qa_scoring_prompt, build_qa_review_prompt
 VALID_QUESTION_TYPES = {"definition", "procedural", "comparative", "factual"}
 VALID_DIFFICULTY = {"easy", "medium", "hard"}
 
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 
 @dataclass
 class LLMReviewOutcome:
@@ -42,19 +45,22 @@ def _truncate_error(error: Exception, max_len: int = 240) -> str:
     return text[: max_len - 3] + "..."
 
 
-def _extract_json(response: str) -> Dict[str, Any] | None:
+def _extract_json(response: str | Dict[str, Any]) -> Dict[str, Any] | None:
+    # Pre-parsed payloads (e.g. trusted fixtures) skip JSON parsing entirely.
+    if isinstance(response, dict):
+        return response
     if not response or not response.strip():
         return None
 
     raw = response.strip()
     candidates = [raw]
 
-    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", raw, re.DOTALL)
+    fenced = _JSON_FENCE_RE.search(raw)
     if fenced:
         candidates.insert(0, fenced.group(1))
 
     if not raw.startswith("{"):
-        generic = re.search(r"\{.*\}", raw, re.DOTALL)
+        generic = _JSON_OBJECT_RE.search(raw)
         if generic:
             candidates.append(generic.group(0))
 
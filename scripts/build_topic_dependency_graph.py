@@ -334,32 +334,33 @@ def _build_outgoing(edges: List[PrereqEdge]) -> Dict[str, set[str]]:
 
 
 def _find_cycle_nodes(graph: Dict[str, set[str]]) -> List[str]:
+    # Iterative DFS (same visit order as the recursive form) so long
+    # prerequisite chains cannot hit the interpreter's recursion limit.
     visited: set[str] = set()
     in_stack: set[str] = set()
     stack: List[str] = []
 
-    def dfs(node: str) -> List[str] | None:
-        visited.add(node)
-        in_stack.add(node)
-        stack.append(node)
-        for nxt in graph.get(node, set()):
-            if nxt not in visited:
-                found = dfs(nxt)
-                if found:
-                    return found
-            elif nxt in in_stack:
-                idx = stack.index(nxt)
-                return stack[idx:] + [nxt]
-        stack.pop()
-        in_stack.remove(node)
-        return None
-
-    for node in list(graph.keys()):
-        if node in visited:
+    for root in list(graph.keys()):
+        if root in visited:
             continue
-        found = dfs(node)
-        if found:
-            return found
+        visited.add(root)
+        in_stack.add(root)
+        stack.append(root)
+        pending = [iter(graph.get(root, set()))]
+        while pending:
+            for nxt in pending[-1]:
+                if nxt not in visited:
+                    visited.add(nxt)
+                    in_stack.add(nxt)
+                    stack.append(nxt)
+                    pending.append(iter(graph.get(nxt, set())))
+                    break
+                if nxt in in_stack:
+                    idx = stack.index(nxt)
+                    return stack[idx:] + [nxt]
+            else:
+                in_stack.remove(stack.pop())
+                pending.pop()
     return []
 
 
@@ -48,14 +48,16 @@ async def _refresh_swot_snapshot(
             ReviewState.card_id.in_(card_ids),
         )
     )
-    attempts_result = await db.execute(
-        select(ReviewAttempt).where(
+    review_states = states_result.scalars().all()
+    # Attempts are streamed in batches; the SWOT engine only keeps per-topic aggregates.
+    review_attempts = await db.stream_scalars(
+        select(ReviewAttempt)
+        .where(
             ReviewAttempt.user_id == user_id,
             ReviewAttempt.card_id.in_(card_ids),
         )
+        .execution_options(yield_per=1000)
     )
-    review_states = states_result.scalars().all()
-    review_attempts = attempts_result.scalars().all()
     await refresh_user_swot(
         db=db,
         user_id=user_id,
@@ -5,10 +5,11 @@ Uses heuristics and src.rag.query_understanding for definition/procedural/compar
 
 from __future__ import annotations
 
+import functools
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.llm import create_client
 from src.rag.query_understanding import analyze as analyze_intent
@@ -154,6 +155,16 @@ Rewritten standalone question:"""
     return None
 
 
+@functools.lru_cache(maxsize=256)
+def _analyze_standalone(query: str) -> Tuple[str, str, Tuple[str, ...], Tuple[str, ...]]:
+    """Heuristic intent/complexity/decomposition for a standalone query (memoized; pure)."""
+    intent_result = analyze_intent(query)
+    complexity = _infer_complexity(query)
+    sub_queries = _decompose(query) if complexity == "multi-part" else [query]
+    entities = _extract_entities(query, intent_result.concept)
+    return _infer_intent(intent_result), complexity, tuple(sub_queries), tuple(entities)
+
+
 class QueryAnalyzer:
     """Analyzes user query for intent, complexity, and sub-queries."""
 
@@ -191,16 +202,12 @@ class QueryAnalyzer:
             reformulated = _reformulate_query(q, history)
             if reformulated:
                 q = reformulated
-        intent_result = analyze_intent(q)
-        intent = _infer_intent(intent_result)
-        complexity = _infer_complexity(q)
-        sub_queries = _decompose(q) if complexity == "multi-part" else [q]
-        entities = _extract_entities(q, intent_result.concept)
+        intent, complexity, sub_queries, entities = _analyze_standalone(q)
         return QueryAnalysis(
             intent=intent,
             complexity=complexity,
-            sub_queries=sub_queries,
-            entities=entities,
+            sub_queries=list(sub_queries),
+            entities=list(entities),
             requires_retrieval=True,
             reformulated_query=reformulated,
         )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
 from dataclasses import dataclass
@@ -9,7 +10,11 @@ from src.llm import create_client
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1)
 def _get_grader_client():
+    # Shared across grade_answer calls, like the variant generator's client.
+    # Construction errors are not cached, so a missing key is retried next call.
     return create_client()
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -43,6 +44,11 @@ class LearningPathPlanner:
 
         outgoing: Dict[Tuple[str, str], set[Tuple[str, str]]] = {k: set() for k in nodes.keys()}
         indegree: Dict[Tuple[str, str], int] = {k: 0 for k in nodes.keys()}
+        # Sort keys are computed once; the insertion counter breaks remaining
+        # ties in the order topics became ready.
+        rank: Dict[Tuple[str, str], Tuple[float, str]] = {
+            key: (-node.priority_score, node.topic_key) for key, node in nodes.items()
+        }
 
         for topic, prereq in prerequisites:
             if topic not in nodes or prereq not in nodes:
@@ -52,32 +58,29 @@ class LearningPathPlanner:
             outgoing[prereq].add(topic)
             indegree[topic] += 1
 
-        ready = [key for key, deg in indegree.items() if deg == 0]
+        ready: List[Tuple[float, str, int, Tuple[str, str]]] = []
+        seq = 0
+        for key, deg in indegree.items():
+            if deg == 0:
+                ready.append((*rank[key], seq, key))
+                seq += 1
+        heapq.heapify(ready)
         ordered_keys: List[Tuple[str, str]] = []
 
         while ready:
-            ready.sort(
-                key=lambda key: (
-                    -nodes[key].priority_score,
-                    nodes[key].topic_key,
-                )
-            )
-            current = ready.pop(0)
+            current = heapq.heappop(ready)[-1]
             ordered_keys.append(current)
             for nxt in sorted(outgoing[current]):
                 indegree[nxt] -= 1
                 if indegree[nxt] == 0:
-                    ready.append(nxt)
+                    heapq.heappush(ready, (*rank[nxt], seq, nxt))
+                    seq += 1
 
         if len(ordered_keys) < len(nodes):
             # If cycles exist, append remaining by priority.
-            remaining = [key for key in nodes.keys() if key not in ordered_keys]
-            remaining.sort(
-                key=lambda key: (
-                    -nodes[key].priority_score,
-                    nodes[key].topic_key,
-                )
-            )
+            placed = set(ordered_keys)
+            remaining = [key for key in nodes.keys() if key not in placed]
+            remaining.sort(key=rank.__getitem__)
             ordered_keys.extend(remaining)
 
         return [nodes[key] for key in ordered_keys]
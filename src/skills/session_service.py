@@ -138,13 +138,15 @@ class QuizSessionService:
         )
         review_states = state_result.scalars().all()
 
-        attempts_result = await db.execute(
-            select(ReviewAttempt).where(
+        # Attempts are streamed in batches; the SWOT engine only keeps per-topic aggregates.
+        review_attempts = await db.stream_scalars(
+            select(ReviewAttempt)
+            .where(
                 ReviewAttempt.user_id == user_id,
                 ReviewAttempt.card_id.in_(card_ids),
             )
+            .execution_options(yield_per=1000)
         )
-        review_attempts = attempts_result.scalars().all()
 
         await refresh_user_swot(
             db=db,
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import datetime as dt
-from dataclasses import dataclass
+import heapq
+import sys
+from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
 from statistics import mean
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from sqlalchemy import and_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import (
@@ -64,6 +67,30 @@ class SWOTConfig:
     threat_trend_amplifier: float = 12.0
 
 
+# Columns overwritten when a (user_id, subject, topic_key) row already exists.
+_MASTERY_UPSERT_COLUMNS = (
+    "attempt_count",
+    "avg_quality",
+    "due_count",
+    "overdue_count",
+    "lapse_count",
+    "recent_trend",
+    "mastery_score",
+    "last_reviewed_at",
+    "updated_at",
+)
+_SWOT_UPSERT_COLUMNS = (
+    "strength_score",
+    "weakness_score",
+    "opportunity_score",
+    "threat_score",
+    "primary_bucket",
+    "rationale",
+    "source",
+    "updated_at",
+)
+
+
 def _clamp(value: float, low: float = 0.0, high: float = 100.0) -> float:
     if value < low:
         return low
@@ -74,15 +101,18 @@ def _clamp(value: float, low: float = 0.0, high: float = 100.0) -> float:
 
 def _topic_identity(card: Card) -> Tuple[str, str]:
     subject = "unknown"
-    if getattr(card, "topic", None) is not None and getattr(card.topic, "name", None):
-        subject = str(card.topic.name).strip().lower()
+    topic_name = getattr(getattr(card, "topic", None), "name", None)
+    if topic_name:
+        subject = str(topic_name).strip().lower()
     topic_key = (card.topic_key or "").strip().lower()
     if not topic_key:
         topic_key = f"{subject}:core"
-    return subject, topic_key
+    # Interned so the (subject, topic_key) dict keys used throughout compute()
+    # share storage and mostly compare by identity.
+    return sys.intern(subject), sys.intern(topic_key)
 
 
-@dataclass
+@dataclass(slots=True)
 class MasterySnapshot:
     subject: str
     topic_key: str
@@ -96,7 +126,7 @@ class MasterySnapshot:
     last_reviewed_at: Optional[dt.datetime]
 
 
-@dataclass
+@dataclass(slots=True)
 class SWOTSnapshot:
     subject: str
     topic_key: str
@@ -109,6 +139,29 @@ class SWOTSnapshot:
     source: str = "rule_hybrid"
 
 
+@dataclass(slots=True)
+class _AttemptStats:
+    """Running per-topic attempt aggregates; only the recent window is kept."""
+
+    count: int = 0
+    quality_sum: int = 0
+    last_attempted_at: Optional[dt.datetime] = None
+    # Min-heap of (attempted_at, seq, quality) holding the newest attempts;
+    # seq keeps input order as the tie-break for equal timestamps.
+    recent: list[tuple[dt.datetime, int, int]] = field(default_factory=list)
+
+    def add(self, attempted_at: dt.datetime, quality: int, window: int) -> None:
+        entry = (attempted_at, self.count, quality)
+        self.count += 1
+        self.quality_sum += quality
+        if self.last_attempted_at is None or attempted_at > self.last_attempted_at:
+            self.last_attempted_at = attempted_at
+        if len(self.recent) < window:
+            heapq.heappush(self.recent, entry)
+        elif self.recent and entry > self.recent[0]:
+            heapq.heapreplace(self.recent, entry)
+
+
 class MasterySWOTEngine:
     """
     Rule-first mastery and SWOT scoring.
@@ -133,21 +186,59 @@ class MasterySWOTEngine:
     ) -> tuple[
         dict[tuple[str, str], MasterySnapshot], dict[tuple[str, str], SWOTSnapshot]
     ]:
-        now = now or dt.datetime.now(dt.timezone.utc)
-        card_by_id = {card.id: card for card in cards}
-        if not card_by_id:
+        topic_for_card = {card.id: _topic_identity(card) for card in cards}
+        if not topic_for_card:
             return {}, {}
 
-        topic_for_card = {
-            card_id: _topic_identity(card) for card_id, card in card_by_id.items()
-        }
-
-        attempts_by_topic: dict[tuple[str, str], list[ReviewAttempt]] = {}
+        attempt_stats: dict[tuple[str, str], _AttemptStats] = {}
         for attempt in review_attempts:
-            topic = topic_for_card.get(attempt.card_id)
-            if topic is None:
-                continue
-            attempts_by_topic.setdefault(topic, []).append(attempt)
+            self._add_attempt(attempt_stats, topic_for_card, attempt)
+        return self._score(topic_for_card, attempt_stats, review_states, now)
+
+    async def compute_stream(
+        self,
+        *,
+        cards: Iterable[Card],
+        review_states: Iterable[ReviewState],
+        review_attempts: AsyncIterable[ReviewAttempt],
+        now: Optional[dt.datetime] = None,
+    ) -> tuple[
+        dict[tuple[str, str], MasterySnapshot], dict[tuple[str, str], SWOTSnapshot]
+    ]:
+        """Same as compute(), but consumes attempts from an async stream."""
+        topic_for_card = {card.id: _topic_identity(card) for card in cards}
+        if not topic_for_card:
+            return {}, {}
+
+        attempt_stats: dict[tuple[str, str], _AttemptStats] = {}
+        async for attempt in review_attempts:
+            self._add_attempt(attempt_stats, topic_for_card, attempt)
+        return self._score(topic_for_card, attempt_stats, review_states, now)
+
+    def _add_attempt(
+        self,
+        attempt_stats: dict[tuple[str, str], _AttemptStats],
+        topic_for_card: dict[int, tuple[str, str]],
+        attempt: ReviewAttempt,
+    ) -> None:
+        topic = topic_for_card.get(attempt.card_id)
+        if topic is None:
+            return
+        stats = attempt_stats.get(topic)
+        if stats is None:
+            stats = attempt_stats[topic] = _AttemptStats()
+        stats.add(attempt.attempted_at, attempt.quality, self.cfg.recent_trend_window)
+
+    def _score(
+        self,
+        topic_for_card: dict[int, tuple[str, str]],
+        attempt_stats: dict[tuple[str, str], _AttemptStats],
+        review_states: Iterable[ReviewState],
+        now: Optional[dt.datetime],
+    ) -> tuple[
+        dict[tuple[str, str], MasterySnapshot], dict[tuple[str, str], SWOTSnapshot]
+    ]:
+        now = now or dt.datetime.now(dt.timezone.utc)
 
         states_by_topic: dict[tuple[str, str], list[ReviewState]] = {}
         for state in review_states:
@@ -157,55 +248,55 @@ class MasterySWOTEngine:
             states_by_topic.setdefault(topic, []).append(state)
 
         active_topics = (
-            set(attempts_by_topic.keys())
+            set(attempt_stats.keys())
             | set(states_by_topic.keys())
             | set(topic_for_card.values())
         )
         mastery_out: dict[tuple[str, str], MasterySnapshot] = {}
         swot_out: dict[tuple[str, str], SWOTSnapshot] = {}
 
+        # Bind hot globals/builtins to locals for the per-topic loop.
+        c = self.cfg
+        # Due/overdue checks compare plain floats/ints instead of tz-aware datetimes.
+        now_ts = now.timestamp()
+        now_ordinal = now.toordinal()
+        clamp, _min, _max, _mean = _clamp, min, max, mean
+
         for topic in active_topics:
-            topic_attempts = sorted(
-                attempts_by_topic.get(topic, []),
-                key=lambda a: a.attempted_at,
-            )
+            stats = attempt_stats.get(topic)
             topic_states = states_by_topic.get(topic, [])
 
-            attempt_count = len(topic_attempts)
-            avg_quality = (
-                mean(a.quality for a in topic_attempts) if topic_attempts else 0.0
-            )
-            recent = topic_attempts[-self.cfg.recent_trend_window :]
-            recent_avg = mean(a.quality for a in recent) if recent else avg_quality
+            attempt_count = stats.count if stats is not None else 0
+            avg_quality = stats.quality_sum / attempt_count if attempt_count else 0.0
+            recent = stats.recent if stats is not None else []
+            recent_avg = _mean(q for _, _, q in recent) if recent else avg_quality
             recent_trend = recent_avg - avg_quality
-            last_reviewed_at = (
-                topic_attempts[-1].attempted_at if topic_attempts else None
-            )
+            last_reviewed_at = stats.last_attempted_at if stats is not None else None
 
-            lapse_count = sum(max(0, s.lapses) for s in topic_states)
+            lapse_count = sum(_max(0, s.lapses) for s in topic_states)
             due_count = 0
             overdue_count = 0
             for state in topic_states:
-                if state.due_at is None:
+                due_at = state.due_at
+                if due_at is None:
                     continue
-                if state.due_at <= now:
+                if due_at.timestamp() <= now_ts:
                     due_count += 1
-                if state.due_at.date() < now.date():
+                if due_at.toordinal() < now_ordinal:
                     overdue_count += 1
 
             # Mastery blends quality, stability (low lapses), momentum, and overdue pressure.
-            c = self.cfg
             quality_norm = avg_quality / c.max_quality_score if attempt_count else 0.0
-            lapse_ratio = min(1.0, lapse_count / max(1.0, float(attempt_count)))
-            trend_component = _clamp(
+            lapse_ratio = _min(1.0, lapse_count / _max(1.0, float(attempt_count)))
+            trend_component = clamp(
                 (recent_trend / c.trend_divisor + c.trend_offset) * c.trend_scale,
                 c.trend_min,
                 c.trend_max,
             )
-            overdue_penalty = min(
+            overdue_penalty = _min(
                 c.max_overdue_penalty, overdue_count * c.overdue_penalty_per_card
             )
-            mastery_score = _clamp(
+            mastery_score = clamp(
                 quality_norm * c.mastery_quality_weight
                 + (1.0 - lapse_ratio) * c.mastery_stability_weight
                 + trend_component
@@ -228,27 +319,27 @@ class MasterySWOTEngine:
             mastery_out[topic] = mastery_snapshot
 
             # SWOT rule-authoritative scoring.
-            exposure = min(1.0, attempt_count / c.full_exposure_attempts)
-            strength = _clamp(
+            exposure = _min(1.0, attempt_count / c.full_exposure_attempts)
+            strength = clamp(
                 mastery_score
                 * (
                     1.0
-                    - min(1.0, overdue_count / max(1, due_count + 1))
+                    - _min(1.0, overdue_count / _max(1, due_count + 1))
                     * c.strength_overdue_damping
                 )
             )
-            weakness = _clamp(
+            weakness = clamp(
                 (c.mastery_ceiling - mastery_score) * c.weakness_deficit_weight
                 + lapse_ratio * c.weakness_lapse_weight
             )
-            opportunity = _clamp(
+            opportunity = clamp(
                 (1.0 - exposure) * c.opportunity_exposure_weight
-                + max(0.0, c.opportunity_mastery_threshold - mastery_score)
+                + _max(0.0, c.opportunity_mastery_threshold - mastery_score)
                 * c.opportunity_gap_weight
             )
-            threat = _clamp(
-                min(c.max_overdue_threat, overdue_count * c.threat_per_overdue_card)
-                + max(0.0, -recent_trend) * c.threat_trend_amplifier
+            threat = clamp(
+                _min(c.max_overdue_threat, overdue_count * c.threat_per_overdue_card)
+                + _max(0.0, -recent_trend) * c.threat_trend_amplifier
             )
 
             bucket_scores = {
@@ -257,7 +348,7 @@ class MasterySWOTEngine:
                 "opportunity": opportunity,
                 "threat": threat,
             }
-            primary_bucket = max(bucket_scores, key=lambda k: bucket_scores[k])
+            primary_bucket = _max(bucket_scores, key=lambda k: bucket_scores[k])
             rationale = (
                 f"mastery={mastery_score:.1f}, avg_quality={avg_quality:.2f}, "
                 f"attempts={attempt_count}, lapses={lapse_count}, "
@@ -277,6 +368,65 @@ class MasterySWOTEngine:
         return mastery_out, swot_out
 
 
+def _mastery_upsert_stmt(
+    user_id: int,
+    mastery: dict[tuple[str, str], MasterySnapshot],
+    now: dt.datetime,
+):
+    rows = [
+        {
+            "user_id": user_id,
+            "subject": snap.subject,
+            "topic_key": snap.topic_key,
+            "attempt_count": snap.attempt_count,
+            "avg_quality": snap.avg_quality,
+            "due_count": snap.due_count,
+            "overdue_count": snap.overdue_count,
+            "lapse_count": snap.lapse_count,
+            "recent_trend": snap.recent_trend,
+            "mastery_score": snap.mastery_score,
+            "last_reviewed_at": snap.last_reviewed_at,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for _, snap in sorted(mastery.items())
+    ]
+    stmt = pg_insert(UserTopicMastery).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "subject", "topic_key"],
+        set_={column: stmt.excluded[column] for column in _MASTERY_UPSERT_COLUMNS},
+    )
+
+
+def _swot_upsert_stmt(
+    user_id: int,
+    swot: dict[tuple[str, str], SWOTSnapshot],
+    now: dt.datetime,
+):
+    rows = [
+        {
+            "user_id": user_id,
+            "subject": snap.subject,
+            "topic_key": snap.topic_key,
+            "strength_score": snap.strength_score,
+            "weakness_score": snap.weakness_score,
+            "opportunity_score": snap.opportunity_score,
+            "threat_score": snap.threat_score,
+            "primary_bucket": snap.primary_bucket,
+            "rationale": snap.rationale,
+            "source": snap.source,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for _, snap in sorted(swot.items())
+    ]
+    stmt = pg_insert(UserTopicSWOT).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "subject", "topic_key"],
+        set_={column: stmt.excluded[column] for column in _SWOT_UPSERT_COLUMNS},
+    )
+
+
 class MasterySWOTRepository:
     async def upsert(
         self,
@@ -286,79 +436,26 @@ class MasterySWOTRepository:
         mastery: dict[tuple[str, str], MasterySnapshot],
         swot: dict[tuple[str, str], SWOTSnapshot],
     ) -> None:
-        keys = sorted(set(mastery.keys()) | set(swot.keys()))
-        if not keys:
-            return
-
-        subjects = sorted({subject for subject, _ in keys})
-        topic_keys = sorted({topic_key for _, topic_key in keys})
-
-        mastery_result = await db.execute(
-            select(UserTopicMastery).where(
-                and_(
-                    UserTopicMastery.user_id == user_id,
-                    UserTopicMastery.subject.in_(subjects),
-                    UserTopicMastery.topic_key.in_(topic_keys),
-                )
-            )
-        )
-        swot_result = await db.execute(
-            select(UserTopicSWOT).where(
-                and_(
-                    UserTopicSWOT.user_id == user_id,
-                    UserTopicSWOT.subject.in_(subjects),
-                    UserTopicSWOT.topic_key.in_(topic_keys),
-                )
-            )
-        )
-        mastery_rows = {
-            (row.subject, row.topic_key): row for row in mastery_result.scalars().all()
-        }
-        swot_rows = {
-            (row.subject, row.topic_key): row for row in swot_result.scalars().all()
-        }
+        """
+        Write mastery/SWOT snapshots in a single round trip.
+
+        Each table gets an INSERT ... ON CONFLICT DO UPDATE keyed on the
+        (user_id, subject, topic_key) unique constraints, so no pre-SELECT is
+        needed. When both are present the mastery upsert rides along as a
+        data-modifying CTE of the SWOT upsert; Postgres always runs such CTEs
+        to completion. Rows are sorted by key to keep lock order stable across
+        concurrent refreshes for the same user.
+        """
         now = dt.datetime.now(dt.timezone.utc)
+        mastery_stmt = _mastery_upsert_stmt(user_id, mastery, now) if mastery else None
+        swot_stmt = _swot_upsert_stmt(user_id, swot, now) if swot else None
 
-        for key, snap in mastery.items():
-            row = mastery_rows.get(key)
-            if row is None:
-                row = UserTopicMastery(
-                    user_id=user_id,
-                    subject=snap.subject,
-                    topic_key=snap.topic_key,
-                    created_at=now,
-                    updated_at=now,
-                )
-                db.add(row)
-            row.attempt_count = snap.attempt_count
-            row.avg_quality = snap.avg_quality
-            row.due_count = snap.due_count
-            row.overdue_count = snap.overdue_count
-            row.lapse_count = snap.lapse_count
-            row.recent_trend = snap.recent_trend
-            row.mastery_score = snap.mastery_score
-            row.last_reviewed_at = snap.last_reviewed_at
-            row.updated_at = now
-
-        for key, snap in swot.items():
-            row = swot_rows.get(key)
-            if row is None:
-                row = UserTopicSWOT(
-                    user_id=user_id,
-                    subject=snap.subject,
-                    topic_key=snap.topic_key,
-                    created_at=now,
-                    updated_at=now,
-                )
-                db.add(row)
-            row.strength_score = snap.strength_score
-            row.weakness_score = snap.weakness_score
-            row.opportunity_score = snap.opportunity_score
-            row.threat_score = snap.threat_score
-            row.primary_bucket = snap.primary_bucket
-            row.rationale = snap.rationale
-            row.source = snap.source
-            row.updated_at = now
+        if mastery_stmt is not None and swot_stmt is not None:
+            await db.execute(swot_stmt.add_cte(mastery_stmt.cte("mastery_upsert")))
+        elif mastery_stmt is not None:
+            await db.execute(mastery_stmt)
+        elif swot_stmt is not None:
+            await db.execute(swot_stmt)
 
 
 async def refresh_user_swot(
@@ -367,17 +464,25 @@ async def refresh_user_swot(
     user_id: int,
     cards: Sequence[Card],
     review_states: Sequence[ReviewState],
-    review_attempts: Sequence[ReviewAttempt],
+    review_attempts: Union[Iterable[ReviewAttempt], AsyncIterable[ReviewAttempt]],
     now: Optional[dt.datetime] = None,
 ) -> tuple[dict[tuple[str, str], MasterySnapshot], dict[tuple[str, str], SWOTSnapshot]]:
     engine = MasterySWOTEngine()
     repo = MasterySWOTRepository()
-    mastery, swot = engine.compute(
-        cards=cards,
-        review_states=review_states,
-        review_attempts=review_attempts,
-        now=now,
-    )
+    if isinstance(review_attempts, AsyncIterable):
+        mastery, swot = await engine.compute_stream(
+            cards=cards,
+            review_states=review_states,
+            review_attempts=review_attempts,
+            now=now,
+        )
+    else:
+        mastery, swot = engine.compute(
+            cards=cards,
+            review_states=review_states,
+            review_attempts=review_attempts,
+            now=now,
+        )
     await repo.upsert(
         db=db,
         user_id=user_id,
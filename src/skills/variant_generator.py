@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
+import functools
 import json
 import logging
 import re
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from src.db.models import Card, ReviewAttempt
 from src.llm import create_client
@@ -22,23 +24,70 @@ except ImportError:  # pragma: no cover – eval package may not be installed
 
 
 _JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_VALID_QUESTION_TYPES = frozenset({"definition", "procedural", "comparative", "factual"})
+_VALID_DIFFICULTIES = frozenset({"easy", "medium", "hard"})
 
 
-def _extract_json_object(raw: str) -> Optional[dict[str, Any]]:
-    if not raw or not raw.strip():
+@functools.lru_cache(maxsize=1)
+def _get_variant_client():
+    # One shared client so repeated generations reuse its HTTP connection pool.
+    # Construction errors are not cached, so a missing key is retried next call.
+    return create_client()
+
+
+def _first_balanced_object(text: str) -> Optional[str]:
+    """Return the first balanced ``{...}`` span in ``text`` via a single O(n) scan.
+
+    Braces inside JSON string literals are ignored so values such as
+    ``"use {} here"`` do not end the object early.
+    """
+    start = text.find("{")
+    if start < 0:
         return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
 
-    text = raw.strip()
-    candidates = [text]
+def _iter_json_candidates(text: str) -> Iterator[str]:
+    """Yield candidate JSON spans lazily, most likely first."""
     fenced = _JSON_FENCE_RE.search(text)
     if fenced:
-        candidates.insert(0, fenced.group(1))
+        yield fenced.group(1)
+    yield text
     if not text.startswith("{"):
-        generic = re.search(r"\{.*\}", text, re.DOTALL)
+        generic = _first_balanced_object(text)
         if generic:
-            candidates.append(generic.group(0))
+            yield generic
+
+
+def _extract_json_object(raw: str) -> Optional[dict[str, Any]]:
+    if not raw or not raw.strip():
+        return None
 
-    for candidate in candidates:
+    tried: set[str] = set()
+    for candidate in _iter_json_candidates(raw.strip()):
+        if candidate in tried:
+            continue
+        tried.add(candidate)
         try:
             parsed = json.loads(candidate)
         except Exception:
@@ -49,19 +98,17 @@ def _extract_json_object(raw: str) -> Optional[dict[str, Any]]:
 
 
 def _valid_payload(payload: dict[str, Any], canonical: Card) -> bool:
-    query = str(payload.get("query") or "").strip()
-    answer = str(payload.get("answer") or "").strip()
+    # Cheap enum checks first: most malformed LLM outputs fail here.
     qtype = str(payload.get("question_type") or "").strip().lower()
-    difficulty = str(payload.get("difficulty") or "").strip().lower()
-    if not query or not answer:
-        return False
-    if query.lower() == canonical.question.strip().lower():
+    if qtype not in _VALID_QUESTION_TYPES:
         return False
-    if qtype not in {"definition", "procedural", "comparative", "factual"}:
+    difficulty = str(payload.get("difficulty") or "").strip().lower()
+    if difficulty not in _VALID_DIFFICULTIES:
         return False
-    if difficulty not in {"easy", "medium", "hard"}:
+    query = str(payload.get("query") or "").strip()
+    if not query or not str(payload.get("answer") or "").strip():
         return False
-    return True
+    return query.lower() != canonical.question.strip().lower()
 
 
 class VariantGenerator:
@@ -80,6 +127,7 @@ class VariantGenerator:
         now = now or dt.datetime.now(dt.timezone.utc)
         variants_result = await db.execute(
             select(Card)
+            .options(selectinload(Card.topic))
             .where(Card.variant_of_card_id == canonical_card.id)
             .order_by(Card.created_at.desc(), Card.id.desc())
         )
@@ -102,17 +150,16 @@ class VariantGenerator:
                 if served_id not in last_seen:
                     last_seen[served_id] = attempted_at
 
-            # Prefer variants with no recent usage first.
-            unseen = [variant for variant in variants if variant.id not in last_seen]
-            if unseen:
-                chosen = unseen[0]
-            else:
-                chosen = sorted(
-                    variants,
-                    key=lambda variant: last_seen.get(
-                        variant.id, dt.datetime.min.replace(tzinfo=dt.timezone.utc)
-                    ),
-                )[0]
+            # Prefer variants with no recent usage first, else the least recently seen.
+            chosen = variants[0]
+            chosen_seen_at: Optional[dt.datetime] = None
+            for variant in variants:
+                seen_at = last_seen.get(variant.id)
+                if seen_at is None:
+                    chosen = variant
+                    break
+                if chosen_seen_at is None or seen_at < chosen_seen_at:
+                    chosen, chosen_seen_at = variant, seen_at
             if chosen.topic is None and canonical_card.topic is not None:  # type: ignore[union-attr]
                 chosen.topic = canonical_card.topic  # type: ignore[assignment]
             return chosen
@@ -169,7 +216,6 @@ class VariantGenerator:
             from src.db.session import AsyncSessionLocal
 
             async with AsyncSessionLocal() as db:
-                now = dt.datetime.now(dt.timezone.utc)
                 variant = Card(
                     topic_id=topic_id,
                     question=payload["query"],
@@ -184,7 +230,6 @@ class VariantGenerator:
                     provenance_json={
                         "source": "runtime_variant_generation_background",
                         "canonical_card_id": canonical_card.id,
-                        "generated_at": now.isoformat(),
                     },
                 )
                 db.add(variant)
@@ -231,7 +276,7 @@ Output format:
 }}
 """
         try:
-            client = create_client()
+            client = _get_variant_client()
             raw = client.generate_single(prompt, max_tokens=500, temperature=0.3)
         except Exception:
             return None
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+_ROOT = Path(__file__).resolve().parents[1]
+
+# bcrypt (cost 4) hash of "Str0ngP@ssw0rd!", so inserted users can still log in.
+_TEST_PASSWORD_HASH = "$2b$04$tnk31wyUbISv7un7kqtTmuzd4nI8Mi23g/Mi5kHom7uFqqIkbn9tW"
+# Under pytest-xdist each worker gets its own shared user, so concurrent
+# get-or-create calls never race on the unique email/username columns.
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+_SHARED_USER_SUFFIX = f"shared_e2e_{_XDIST_WORKER}" if _XDIST_WORKER else "shared_e2e"
+
+
+@pytest.fixture(scope="session")
+def clock() -> SimpleNamespace:
+    """Fixed reference time for scheduling tests, with the common offsets precomputed."""
+    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
+    return SimpleNamespace(
+        now=now,
+        yesterday=now - dt.timedelta(days=1),
+        tomorrow=now + dt.timedelta(days=1),
+        two_days_ago=now - dt.timedelta(days=2),
+    )
+
+
+async def _create_schema_if_unversioned() -> bool:
+    # One create_all pass instead of replaying every Alembic revision, but only
+    # on a database Alembic has never touched; returns whether it ran.
+    from sqlalchemy import inspect, text
+
+    from src.db.models import Base
+    from src.db.session import engine
+
+    try:
+        async with engine.begin() as conn:
+            versioned = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).has_table("alembic_version")
+            )
+            if versioned:
+                return False
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            await conn.run_sync(Base.metadata.create_all)
+            return True
+    finally:
+        # Pooled connections belong to this loop; the app opens its own.
+        await engine.dispose()
+
+
+def _prepare_database() -> None:
+    """
+    Bring the test database to the current schema.
+
+    A fresh database gets create_all and is then stamped at head, so a later
+    `alembic upgrade head` (e.g. entrypoint.sh) sees it as migrated. A database
+    Alembic already manages is upgraded instead, so missing columns are added
+    rather than silently skipped.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    # No ini file: alembic/env.py takes the URL from DATABASE_URL, and the
+    # ini's logging config would otherwise replace pytest's handlers.
+    cfg = Config()
+    cfg.set_main_option("script_location", str(_ROOT / "alembic"))
+    if asyncio.run(_create_schema_if_unversioned()):
+        command.stamp(cfg, "head")
+    else:
+        command.upgrade(cfg, "head")
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    # One app lifespan for the whole run; startup kicks off chunk loading and
+    # agent construction, which is the dominant fixed cost of the API tests.
+    from src.api.main import app
+
+    _prepare_database()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def create_auth_user(
+    client: TestClient,
+) -> Callable[[str], tuple[dict[str, str], int]]:
+    """
+    Factory for users with a ready-to-send bearer header.
+
+    The user row is written directly and the access token is minted with the
+    app's signer, skipping the signup route (validation, hashing, rate limit).
+    The suffix picks the email/username; an existing user with that email is
+    reused rather than duplicated.
+    Returns (auth_headers, user_id); pass the headers on `client` requests.
+    """
+    from sqlalchemy import select
+
+    from src.auth.service import create_access_token
+    from src.db.models import User
+    from src.db.session import AsyncSessionLocal
+
+    async def _insert_user(suffix: str) -> int:
+        async with AsyncSessionLocal() as db:
+            email = f"quiz_{suffix}@example.com"
+            existing = await db.execute(select(User.id).where(User.email == email))
+            user_id = existing.scalar_one_or_none()
+            if user_id is not None:
+                return user_id
+            user = User(
+                email=email,
+                username=f"quiz_{suffix}",
+                hashed_password=_TEST_PASSWORD_HASH,
+            )
+            db.add(user)
+            await db.commit()
+            return user.id
+
+    def _create(suffix: str) -> tuple[dict[str, str], int]:
+        # Run on the app's event loop so the engine's pooled connections stay valid.
+        user_id = client.portal.call(_insert_user, suffix)
+        token = create_access_token(user_id)
+        return {"Authorization": f"Bearer {token}"}, user_id
+
+    return _create
+
+
+@pytest.fixture(scope="session")
+def shared_user(create_auth_user) -> tuple[dict[str, str], int]:
+    """One deterministic user reused by every authenticated API test (and run)."""
+    return create_auth_user(_SHARED_USER_SUFFIX)
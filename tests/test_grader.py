@@ -14,7 +14,8 @@ class _StubClient:
 
 
 def _patch_client(monkeypatch, raw: str) -> None:
-    monkeypatch.setattr(grader, "create_client", lambda: _StubClient(raw))
+    # Patch the cached accessor itself so no stub outlives its test.
+    monkeypatch.setattr(grader, "_get_grader_client", lambda: _StubClient(raw))
 
 
 def test_grade_answer_parses_remediation_fields(monkeypatch) -> None:
@@ -1,21 +1,102 @@
 from __future__ import annotations
 
+import json
+from typing import Any
+
+import pytest
+
 from eval.generation.generate_qa import generate_questions_from_chunk
 from eval.generation.llm_review import review_questions_with_llm
 from src.rag.index import ChunkRecord
 
 
 class FakeLLMClient:
-    def __init__(self, responses: list[str]) -> None:
+    """Returns queued responses in order; dict responses are handed back pre-parsed."""
+
+    def __init__(self, responses: list[str | dict[str, Any]]) -> None:
         self._responses = list(responses)
 
-    def generate_single(self, *_args, **_kwargs) -> str:
+    def generate_single(self, *_args, **_kwargs) -> str | dict[str, Any]:
         if not self._responses:
             return ""
         return self._responses.pop(0)
 
 
-def _chunk() -> ChunkRecord:
+# Reviewer/generator responses, built once at import and shared read-only.
+_REWRITE_REVIEW = {
+    "results": [
+        {
+            "index": 0,
+            "decision": "rewrite",
+            "score": 84,
+            "reasons": ["original was too shallow"],
+            "revised": {
+                "query": "Why does packet switching usually provide better link utilization than circuit switching for bursty traffic?",
+                "answer": "Packet switching multiplexes many bursty flows on shared links, so capacity is not reserved for idle senders. Circuit switching reserves bandwidth even during silence, which can waste capacity. Under bursty workloads, statistical sharing tends to increase utilization while trading off queueing delay.",
+                "question_type": "comparative",
+                "atomic_facts": [
+                    "circuit switching reserves idle bandwidth",
+                    "packet switching statistically multiplexes flows",
+                    "higher utilization comes with delay trade-offs",
+                ],
+                "difficulty": "medium",
+            },
+        }
+    ]
+}
+
+_LOW_SCORE_REVIEW = {
+    "results": [
+        {
+            "index": 0,
+            "decision": "keep",
+            "score": 62,
+            "reasons": ["too basic for interview depth"],
+        }
+    ]
+}
+
+# Generation output still goes through generate_qa's text parser, so it stays text.
+_GENERATION_RESPONSE = json.dumps(
+    {
+        "questions": [
+            {
+                "query": "What is packet switching?",
+                "answer": "Packet switching sends data as packets.",
+                "question_type": "definition",
+                "atomic_facts": ["data split in packets", "packets forwarded independently"],
+                "difficulty": "easy",
+                "placement_interview_score": 96,
+            }
+        ]
+    }
+)
+
+_SECOND_PASS_REVIEW = {
+    "results": [
+        {
+            "index": 0,
+            "decision": "rewrite",
+            "score": 86,
+            "reasons": ["requires deeper framing"],
+            "revised": {
+                "query": "How does packet switching trade throughput efficiency against queueing delay during congestion?",
+                "answer": "Packet switching keeps links busy by multiplexing many flows rather than reserving dedicated circuits. During congestion, queues build and delay can increase even as utilization stays high. This is a core efficiency versus latency trade-off in packet networks.",
+                "question_type": "procedural",
+                "atomic_facts": [
+                    "statistical multiplexing increases utilization",
+                    "congestion increases queueing delay",
+                    "design involves efficiency-latency trade-off",
+                ],
+                "difficulty": "medium",
+            },
+        }
+    ]
+}
+
+
+@pytest.fixture(scope="module")
+def chunk() -> ChunkRecord:
     return ChunkRecord(
         id="chunk_1",
         book_id="Computer Networks",
@@ -31,32 +112,8 @@ def _chunk() -> ChunkRecord:
     )
 
 
-def test_llm_review_rewrite_accepts_revised_question() -> None:
-    client = FakeLLMClient(
-        [
-            """{
-              "results": [
-                {
-                  "index": 0,
-                  "decision": "rewrite",
-                  "score": 84,
-                  "reasons": ["original was too shallow"],
-                  "revised": {
-                    "query": "Why does packet switching usually provide better link utilization than circuit switching for bursty traffic?",
-                    "answer": "Packet switching multiplexes many bursty flows on shared links, so capacity is not reserved for idle senders. Circuit switching reserves bandwidth even during silence, which can waste capacity. Under bursty workloads, statistical sharing tends to increase utilization while trading off queueing delay.",
-                    "question_type": "comparative",
-                    "atomic_facts": [
-                      "circuit switching reserves idle bandwidth",
-                      "packet switching statistically multiplexes flows",
-                      "higher utilization comes with delay trade-offs"
-                    ],
-                    "difficulty": "medium"
-                  }
-                }
-              ]
-            }"""
-        ]
-    )
+def test_llm_review_rewrite_accepts_revised_question(chunk: ChunkRecord) -> None:
+    client = FakeLLMClient([_REWRITE_REVIEW])
     question = {
         "query": "What is packet switching?",
         "answer": "It is a method of sending data in packets.",
@@ -67,7 +124,7 @@ def test_llm_review_rewrite_accepts_revised_question() -> None:
 
     outcome = review_questions_with_llm(
         questions=[question],
-        chunk=_chunk(),
+        chunk=chunk,
         llm_client=client,  # type: ignore[arg-type]
         min_score=70,
         allow_rewrite=True,
@@ -81,21 +138,8 @@ def test_llm_review_rewrite_accepts_revised_question() -> None:
     assert rewritten["llm_review_decision"] == "rewrite"
 
 
-def test_llm_review_rejects_low_score_even_if_keep() -> None:
-    client = FakeLLMClient(
-        [
-            """{
-              "results": [
-                {
-                  "index": 0,
-                  "decision": "keep",
-                  "score": 62,
-                  "reasons": ["too basic for interview depth"]
-                }
-              ]
-            }"""
-        ]
-    )
+def test_llm_review_rejects_low_score_even_if_keep(chunk: ChunkRecord) -> None:
+    client = FakeLLMClient([_LOW_SCORE_REVIEW])
     question = {
         "query": "What is the Internet?",
         "answer": "The Internet is a network of networks.",
@@ -106,7 +150,7 @@ def test_llm_review_rejects_low_score_even_if_keep() -> None:
 
     outcome = review_questions_with_llm(
         questions=[question],
-        chunk=_chunk(),
+        chunk=chunk,
         llm_client=client,  # type: ignore[arg-type]
         min_score=70,
     )
@@ -116,44 +160,12 @@ def test_llm_review_rejects_low_score_even_if_keep() -> None:
     assert len(outcome.rejected) == 1
 
 
-def test_generate_questions_from_chunk_llm_only_uses_second_pass() -> None:
-    generation_json = """{
-      "questions": [
-        {
-          "query": "What is packet switching?",
-          "answer": "Packet switching sends data as packets.",
-          "question_type": "definition",
-          "atomic_facts": ["data split in packets", "packets forwarded independently"],
-          "difficulty": "easy",
-          "placement_interview_score": 96
-        }
-      ]
-    }"""
-    review_json = """{
-      "results": [
-        {
-          "index": 0,
-          "decision": "rewrite",
-          "score": 86,
-          "reasons": ["requires deeper framing"],
-          "revised": {
-            "query": "How does packet switching trade throughput efficiency against queueing delay during congestion?",
-            "answer": "Packet switching keeps links busy by multiplexing many flows rather than reserving dedicated circuits. During congestion, queues build and delay can increase even as utilization stays high. This is a core efficiency versus latency trade-off in packet networks.",
-            "question_type": "procedural",
-            "atomic_facts": [
-              "statistical multiplexing increases utilization",
-              "congestion increases queueing delay",
-              "design involves efficiency-latency trade-off"
-            ],
-            "difficulty": "medium"
-          }
-        }
-      ]
-    }"""
-
-    client = FakeLLMClient([generation_json, review_json])
+def test_generate_questions_from_chunk_llm_only_uses_second_pass(
+    chunk: ChunkRecord,
+) -> None:
+    client = FakeLLMClient([_GENERATION_RESPONSE, _SECOND_PASS_REVIEW])
     result = generate_questions_from_chunk(
-        _chunk(),
+        chunk,
         client,  # type: ignore[arg-type]
         num_questions=1,
         min_score=70,
@@ -165,3 +177,78 @@ def test_generate_questions_from_chunk_llm_only_uses_second_pass() -> None:
     assert result[0]["quality_score"] >= 70
     assert result[0]["query"].lower().startswith("how does packet switching")
 
+
+# (case, review result or None if the LLM omits it, expected decision, accepted?)
+_BATCH_SCENARIOS = [
+    (
+        "keep_high_score",
+        {"decision": "keep", "score": 91, "reasons": ["probes trade-offs"]},
+        "keep",
+        True,
+    ),
+    (
+        "keep_low_score",
+        {"decision": "keep", "score": 55, "reasons": ["too shallow"]},
+        "keep",
+        False,
+    ),
+    (
+        "rewrite_invalid_payload",
+        {
+            "decision": "rewrite",
+            "score": 88,
+            "reasons": ["needs depth"],
+            "revised": {"query": "Why?", "answer": "Because.", "question_type": "factual"},
+        },
+        "reject",
+        False,
+    ),
+    (
+        "explicit_reject",
+        {"decision": "reject", "score": 95, "reasons": ["off topic"]},
+        "reject",
+        False,
+    ),
+    ("missing_result", None, "reject", False),
+]
+
+
+@pytest.fixture(scope="module")
+def batch_outcome(chunk: ChunkRecord):
+    questions = [
+        {
+            "case": case,
+            "query": f"Question for {case}?",
+            "answer": "Packet switching multiplexes bursty flows on shared links.",
+            "question_type": "definition",
+            "difficulty": "medium",
+            "atomic_facts": ["shared links", "statistical multiplexing"],
+        }
+        for case, *_ in _BATCH_SCENARIOS
+    ]
+    results = [
+        {"index": idx, **result}
+        for idx, (_, result, _, _) in enumerate(_BATCH_SCENARIOS)
+        if result is not None
+    ]
+    client = FakeLLMClient([{"results": results}])
+    return review_questions_with_llm(
+        questions=questions,
+        chunk=chunk,
+        llm_client=client,  # type: ignore[arg-type]
+        min_score=70,
+    )
+
+
+@pytest.mark.parametrize(
+    "case,expected_decision,expected_accepted",
+    [(case, decision, accepted) for case, _, decision, accepted in _BATCH_SCENARIOS],
+)
+def test_llm_review_batch_outcomes(
+    batch_outcome, case: str, expected_decision: str, expected_accepted: bool
+) -> None:
+    assert batch_outcome.success is True
+    bucket = batch_outcome.accepted if expected_accepted else batch_outcome.rejected
+    matches = [q for q in bucket if q["case"] == case]
+    assert len(matches) == 1
+    assert matches[0]["llm_review_decision"] == expected_decision
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from src.skills.path_planner import LearningPathPlanner, PathNode
 
 
@@ -21,8 +23,12 @@ def _node(
     )
 
 
-def test_order_nodes_respects_prerequisites_even_if_priority_lower():
-    planner = LearningPathPlanner()
+@pytest.fixture(scope="module")
+def planner() -> LearningPathPlanner:
+    return LearningPathPlanner()
+
+
+def test_order_nodes_respects_prerequisites_even_if_priority_lower(planner: LearningPathPlanner):
     os_process = _node(
         subject="os",
         topic_key="os:process",
@@ -49,8 +55,7 @@ def test_order_nodes_respects_prerequisites_even_if_priority_lower():
     assert [n.topic_key for n in ordered] == ["os:process", "os:deadlock"]
 
 
-def test_order_nodes_uses_priority_when_no_prerequisites():
-    planner = LearningPathPlanner()
+def test_order_nodes_uses_priority_when_no_prerequisites(planner: LearningPathPlanner):
     a = _node(
         subject="dbms",
         topic_key="dbms:index",
@@ -73,3 +78,26 @@ def test_order_nodes_uses_priority_when_no_prerequisites():
         prerequisites=[],
     )
     assert [n.topic_key for n in ordered] == ["dbms:index", "dbms:sql"]
+
+
+def test_order_nodes_appends_cycle_members_by_priority(planner: LearningPathPlanner):
+    nodes = {
+        ("cn", f"cn:t{i}"): _node(
+            subject="cn",
+            topic_key=f"cn:t{i}",
+            mastery_score=50.0,
+            swot_bucket="opportunity",
+            priority_score=float(i),
+        )
+        for i in range(4)
+    }
+    # t0 is free; t1 -> t2 -> t3 -> t1 form a cycle.
+    ordered = planner.order_nodes(
+        nodes=nodes,
+        prerequisites=[
+            (("cn", "cn:t1"), ("cn", "cn:t3")),
+            (("cn", "cn:t2"), ("cn", "cn:t1")),
+            (("cn", "cn:t3"), ("cn", "cn:t2")),
+        ],
+    )
+    assert [n.topic_key for n in ordered] == ["cn:t0", "cn:t3", "cn:t2", "cn:t1"]
@@ -2,89 +2,92 @@
 Integration tests for quiz-related FastAPI endpoints.
 
 These tests assume:
-- The database is reachable (as configured in DATABASE_URL).
-- Core tables have been created via Alembic.
+- DATABASE_URL points at a dedicated test database, never a shared dev or
+  production one: the session writes users and sessions into it.
+- The schema is prepared once per session (see tests/conftest.py): a fresh
+  database gets create_all and is stamped at Alembic head, one Alembic
+  already manages is upgraded to head.
 They do not depend on any pre-seeded Card/Topic data; they focus on
 auth wiring, status codes, and basic response shapes.
 """
 
 from __future__ import annotations
 
+import asyncio
+
 from fastapi.testclient import TestClient
+import httpx
 import pytest
 
-from src.api.main import app
-
-
-def _signup_and_get_token(client: TestClient) -> str:
-    # Use a unique email/username per run to avoid conflicts.
-    import uuid
-
-    suffix = uuid.uuid4().hex[:8]
-    email = f"quiz_{suffix}@example.com"
-    username = f"quiz_{suffix}"
-    password = "Str0ngP@ssw0rd!"
-
-    r = client.post(
-        "/auth/signup",
-        json={"email": email, "username": username, "password": password},
-    )
-    assert r.status_code == 201
-    data = r.json()
-    assert "access_token" in data
-    return data["access_token"]
-
 
 @pytest.fixture(scope="module")
-def client() -> TestClient:
-    with TestClient(app) as test_client:
-        yield test_client
-
-
-def test_quiz_endpoints_require_auth(client: TestClient):
-    # Without auth, quiz endpoints should reject the request.
-    r_topics = client.get("/api/quiz/topics")
-    r_stats = client.get("/api/quiz/stats")
-    r_session_start = client.post("/api/quiz/sessions/start", json={})
-    r_session_answer = client.post(
+def auth_headers(shared_user) -> dict[str, str]:
+    # Requests go through the shared `client` so they run on the same event
+    # loop as the app's pooled DB connections.
+    headers, _user_id = shared_user
+    return headers
+
+
+_UNAUTHENTICATED_REQUESTS = [
+    ("GET", "/api/quiz/topics", None),
+    ("GET", "/api/quiz/stats", None),
+    ("POST", "/api/quiz/sessions/start", {}),
+    (
+        "POST",
         "/api/quiz/sessions/fake-session/answer",
-        json={"card_id": 1, "user_answer": "test"},
-    )
-    r_session_finish = client.post("/api/quiz/sessions/fake-session/finish")
-
-    assert r_topics.status_code == 401
-    assert r_stats.status_code == 401
-    assert r_session_start.status_code == 401
-    assert r_session_answer.status_code == 401
-    assert r_session_finish.status_code == 401
-
-
-def test_quiz_topics_and_stats_authenticated(client: TestClient):
-    token = _signup_and_get_token(client)
-    headers = {"Authorization": f"Bearer {token}"}
-
+        {"card_id": 1, "user_answer": "test"},
+    ),
+    ("POST", "/api/quiz/sessions/fake-session/finish", None),
+]
+
+
+@pytest.mark.anyio
+async def test_quiz_endpoints_require_auth():
+    # Without auth, quiz endpoints should reject the request. Rejection happens
+    # in the auth dependency, so no lifespan (or DB) is needed: the requests go
+    # straight through an in-process ASGI transport, concurrently.
+    from src.api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(
+                ac.request(method, path, json=body)
+                for method, path, body in _UNAUTHENTICATED_REQUESTS
+            )
+        )
+
+    status_by_endpoint = {
+        f"{method} {path}": r.status_code
+        for (method, path, _), r in zip(_UNAUTHENTICATED_REQUESTS, responses)
+    }
+    assert status_by_endpoint == {endpoint: 401 for endpoint in status_by_endpoint}
+
+
+def test_quiz_topics_and_stats_authenticated(
+    client: TestClient, auth_headers: dict[str, str]
+):
     # Topics
-    r_topics = client.get("/api/quiz/topics", headers=headers)
+    r_topics = client.get("/api/quiz/topics", headers=auth_headers)
     assert r_topics.status_code == 200
     topics = r_topics.json()
     assert isinstance(topics, list)
 
     # Stats
-    r_stats = client.get("/api/quiz/stats", headers=headers)
+    r_stats = client.get("/api/quiz/stats", headers=auth_headers)
     assert r_stats.status_code == 200
     stats = r_stats.json()
     assert "topics" in stats
     assert isinstance(stats["topics"], list)
 
 
-def test_quiz_session_start_and_finish_authenticated(client: TestClient):
-    token = _signup_and_get_token(client)
-    headers = {"Authorization": f"Bearer {token}"}
-
+def test_quiz_session_start_and_finish_authenticated(
+    client: TestClient, auth_headers: dict[str, str]
+):
     r_start = client.post(
         "/api/quiz/sessions/start",
         json={"limit": 5},
-        headers=headers,
+        headers=auth_headers,
     )
     assert r_start.status_code == 200
     start_data = r_start.json()
@@ -103,7 +106,7 @@ def test_quiz_session_start_and_finish_authenticated(client: TestClient):
     r_answer = client.post(
         f"/api/quiz/sessions/{session_id}/answer",
         json={"card_id": 999999, "user_answer": "attempt"},
-        headers=headers,
+        headers=auth_headers,
     )
     # If no cards exist, session is complete; otherwise invalid current card.
     if r_answer.status_code == 200:
@@ -118,8 +121,7 @@ def test_quiz_session_start_and_finish_authenticated(client: TestClient):
         assert r_answer.status_code in (400, 404)
 
     r_finish = client.post(
-        f"/api/quiz/sessions/{session_id}/finish",
-        headers=headers,
+        f"/api/quiz/sessions/{session_id}/finish", headers=auth_headers
     )
     assert r_finish.status_code == 200
     finish_data = r_finish.json()
@@ -40,17 +40,22 @@ def _make_state(user_id: int, card_id: int, due_at: dt.datetime | None) -> Revie
     )
 
 
-def test_get_next_cards_prioritizes_due_then_new():
+# Shared, read-only card pool; the service never mutates cards. States are
+# still built per test because tests (and the scheduler) mutate them.
+TOPIC_OS = _make_topic("os", 1)
+TOPIC_CN = _make_topic("cn", 2)
+CARDS_OS = {i: _make_card(i, TOPIC_OS) for i in (1, 2, 3)}
+CARDS_CN = {i: _make_card(i, TOPIC_CN) for i in (2, 3)}
+
+
+def test_get_next_cards_prioritizes_due_then_new(clock):
     svc = QuizService(QuizSelectionConfig(default_limit=10))
-    topic = _make_topic("os", 1)
 
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
-    past = now - dt.timedelta(days=1)
-    future = now + dt.timedelta(days=1)
+    now = clock.now
+    past = clock.yesterday
+    future = clock.tomorrow
 
-    c1 = _make_card(1, topic)
-    c2 = _make_card(2, topic)
-    c3 = _make_card(3, topic)
+    c1, c2, c3 = CARDS_OS[1], CARDS_OS[2], CARDS_OS[3]
 
     # c2 is due, c1 is scheduled in the future, c3 is new (no state).
     s1 = _make_state(user_id=1, card_id=1, due_at=future)
@@ -72,16 +77,14 @@ def test_get_next_cards_prioritizes_due_then_new():
     assert [c.id for c in selected] == [2, 3]
 
 
-def test_get_next_cards_filters_by_topic():
+def test_get_next_cards_filters_by_topic(clock):
     svc = QuizService()
-    topic_os = _make_topic("os", 1)
-    topic_cn = _make_topic("cn", 2)
 
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
-    past = now - dt.timedelta(days=1)
+    now = clock.now
+    past = clock.yesterday
 
-    c1 = _make_card(1, topic_os)
-    c2 = _make_card(2, topic_cn)
+    c1 = CARDS_OS[1]
+    c2 = CARDS_CN[2]
 
     s1 = _make_state(user_id=1, card_id=1, due_at=past)
     s2 = _make_state(user_id=1, card_id=2, due_at=past)
@@ -98,16 +101,13 @@ def test_get_next_cards_filters_by_topic():
     assert [c.id for c in selected] == [1]
 
 
-def test_get_next_cards_respects_limit():
+def test_get_next_cards_respects_limit(clock):
     svc = QuizService(QuizSelectionConfig(default_limit=2))
-    topic = _make_topic("os", 1)
 
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
-    past = now - dt.timedelta(days=1)
+    now = clock.now
+    past = clock.yesterday
 
-    c1 = _make_card(1, topic)
-    c2 = _make_card(2, topic)
-    c3 = _make_card(3, topic)
+    c1, c2, c3 = CARDS_OS[1], CARDS_OS[2], CARDS_OS[3]
 
     s1 = _make_state(user_id=1, card_id=1, due_at=past)
 
@@ -125,11 +125,10 @@ def test_get_next_cards_respects_limit():
     assert selected[0].id == 1
 
 
-def test_record_attempt_creates_state_for_new_card():
+def test_record_attempt_creates_state_for_new_card(clock):
     svc = QuizService()
-    topic = _make_topic("os", 1)
-    card = _make_card(1, topic)
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
+    card = CARDS_OS[1]
+    now = clock.now
 
     state, attempt = svc.record_attempt(
         user_id=1,
@@ -154,11 +153,10 @@ def test_record_attempt_creates_state_for_new_card():
     assert attempt.response_time_ms == 1234
 
 
-def test_record_attempt_tracks_served_variant_id():
+def test_record_attempt_tracks_served_variant_id(clock):
     svc = QuizService()
-    topic = _make_topic("os", 1)
-    card = _make_card(1, topic)
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
+    card = CARDS_OS[1]
+    now = clock.now
 
     _state, attempt = svc.record_attempt(
         user_id=1,
@@ -173,20 +171,16 @@ def test_record_attempt_tracks_served_variant_id():
     assert attempt.served_card_id == 99
 
 
-def test_get_stats_counts_per_topic():
+def test_get_stats_counts_per_topic(clock):
     svc = QuizService()
-    topic_os = _make_topic("os", 1)
-    topic_cn = _make_topic("cn", 2)
 
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
+    now = clock.now
     today = now
-    yesterday = now - dt.timedelta(days=1)
-    tomorrow = now + dt.timedelta(days=1)
+    yesterday = clock.yesterday
+    tomorrow = clock.tomorrow
 
     # Cards
-    c1 = _make_card(1, topic_os)
-    c2 = _make_card(2, topic_os)
-    c3 = _make_card(3, topic_cn)
+    c1, c2, c3 = CARDS_OS[1], CARDS_OS[2], CARDS_CN[3]
 
     # States: one learned and overdue in os, one due today in os, one learned in cn but future due
     s1 = _make_state(user_id=1, card_id=1, due_at=yesterday)
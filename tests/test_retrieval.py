@@ -4,22 +4,22 @@ Tests for RAG retrieval pipeline.
 
 from __future__ import annotations
 
+import os
+from typing import TYPE_CHECKING
+
 import pytest
 
-from src.rag import (
-    BM25Index,
-    ChunkRecord,
-    DenseIndex,
-    HybridSearcher,
-    RAGConfig,
-    RetrievalResult,
-    load_chunks,
-)
+# src.rag pulls in sentence-transformers/torch; import it only inside the
+# fixtures and tests that run, so filtered collections (-k) stay cheap.
+if TYPE_CHECKING:
+    from src.rag import BM25Index, ChunkRecord, DenseIndex, HybridSearcher, RAGConfig
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_chunks() -> list[ChunkRecord]:
     """Create sample chunks for testing."""
+    from src.rag import ChunkRecord
+
     return [
         ChunkRecord(
             id="test_001",
@@ -51,75 +51,158 @@ def sample_chunks() -> list[ChunkRecord]:
     ]
 
 
-def test_bm25_index_search(sample_chunks: list[ChunkRecord]):
-    """Test BM25 index search."""
-    index = BM25Index.from_chunks(sample_chunks)
-    results = index.search("deadlock", top_k=2)
-    
-    assert len(results) > 0
-    assert results[0][0].id == "test_001"
-    assert results[0][1] > 0
+# Indexes are built once per session: the dense ones load the embedding model,
+# which dwarfs every assertion below. Tests only search, never mutate them.
 
 
-def test_dense_index_search(sample_chunks: list[ChunkRecord]):
-    """Test dense index search."""
-    index = DenseIndex.from_chunks(sample_chunks)
-    results = index.search("what is a deadlock", top_k=2)
-    
-    assert len(results) > 0
-    assert results[0][1] > 0
+# List embedding_backend first wherever it is used: same-scope fixtures are set
+# up in signature order, and sample_chunks already imports src.rag (and with it
+# sentence_transformers).
+@pytest.fixture(scope="session")
+def embedding_backend() -> None:
+    """Skip dense tests unless the embedding model is already on disk (no downloads)."""
+    pytest.importorskip("sentence_transformers")
+    from huggingface_hub import try_to_load_from_cache
 
+    from src.rag.dense import EMBEDDING_MODEL
 
-def test_hybrid_searcher_search(sample_chunks: list[ChunkRecord]):
-    """Test HybridSearcher search returns RetrievalResult."""
-    searcher = HybridSearcher.from_chunks(
+    if os.path.isdir(EMBEDDING_MODEL):
+        return
+    # Bare names resolve under the sentence-transformers org, as in SentenceTransformer().
+    repo_id = (
+        EMBEDDING_MODEL
+        if "/" in EMBEDDING_MODEL
+        else f"sentence-transformers/{EMBEDDING_MODEL}"
+    )
+    if not isinstance(try_to_load_from_cache(repo_id, "config.json"), str):
+        pytest.skip(f"embedding model {repo_id} is not cached")
+
+
+@pytest.fixture(scope="session")
+def bm25_index(sample_chunks: list[ChunkRecord]) -> BM25Index:
+    from src.rag import BM25Index
+
+    return BM25Index.from_chunks(sample_chunks)
+
+
+@pytest.fixture(scope="session")
+def dense_index(embedding_backend: None, sample_chunks: list[ChunkRecord]) -> DenseIndex:
+    from src.rag import DenseIndex
+
+    return DenseIndex.from_chunks(sample_chunks)
+
+
+@pytest.fixture(scope="session")
+def hybrid_searcher(
+    embedding_backend: None, sample_chunks: list[ChunkRecord]
+) -> HybridSearcher:
+    from src.rag import HybridSearcher
+
+    return HybridSearcher.from_chunks(
         sample_chunks,
         use_reranker=False,
         use_hyde=False,
     )
-    results = searcher.search("deadlock", top_k=2)
-    
-    assert len(results) > 0
-    assert isinstance(results[0], RetrievalResult)
-    assert results[0].chunk.id == "test_001"
-    assert results[0].score > 0
-    assert results[0].source in ("hybrid", "reranked")
 
 
-def test_hybrid_searcher_with_config(sample_chunks: list[ChunkRecord]):
-    """Test HybridSearcher with custom RAGConfig."""
-    config = RAGConfig(
+@pytest.fixture(scope="session")
+def rag_config() -> RAGConfig:
+    from src.rag import RAGConfig
+
+    return RAGConfig(
         use_hyde=False,
         use_reranker=False,
         use_query_rewriting=True,
         top_k=3,
         candidate_k=10,
     )
-    searcher = HybridSearcher.from_chunks(sample_chunks, config=config)
-    results = searcher.search("deadlock")
+
+
+@pytest.fixture(scope="session")
+def configured_hybrid_searcher(
+    embedding_backend: None, sample_chunks: list[ChunkRecord], rag_config: RAGConfig
+) -> HybridSearcher:
+    from src.rag import HybridSearcher
+
+    return HybridSearcher.from_chunks(sample_chunks, config=rag_config)
+
+
+def test_bm25_index_search(bm25_index: BM25Index):
+    """Test BM25 index search."""
+    results = bm25_index.search("deadlock", top_k=2)
     
-    assert len(results) <= config.top_k
-    assert all(isinstance(r, RetrievalResult) for r in results)
+    assert len(results) > 0
+    assert results[0][0].id == "test_001"
+    assert results[0][1] > 0
 
 
-def test_hybrid_searcher_search_raw(sample_chunks: list[ChunkRecord]):
-    """Test HybridSearcher search_raw for backward compatibility."""
-    searcher = HybridSearcher.from_chunks(
-        sample_chunks,
-        use_reranker=False,
-        use_hyde=False,
-    )
-    results = searcher.search_raw("deadlock", top_k=2)
+def test_dense_index_search(dense_index: DenseIndex):
+    """Test dense index search."""
+    results = dense_index.search("what is a deadlock", top_k=2)
     
     assert len(results) > 0
-    assert isinstance(results[0], tuple)
-    assert len(results[0]) == 2
-    assert isinstance(results[0][0], ChunkRecord)
-    assert isinstance(results[0][1], float)
+    assert results[0][1] > 0
+
+
+# Result type is named rather than imported: src.rag is only imported lazily.
+# unpack maps a result to (chunk, score, source); search_raw carries no source.
+@pytest.mark.parametrize(
+    "method_name,result_type,unpack,expected_sources",
+    [
+        pytest.param(
+            "search",
+            "RetrievalResult",
+            lambda r: (r.chunk, r.score, r.source),
+            {"hybrid", "reranked"},
+            id="search",
+        ),
+        pytest.param(
+            "search_raw",
+            "tuple",
+            lambda r: (*r, None),
+            {None},
+            id="search_raw",
+        ),
+    ],
+)
+def test_hybrid_searcher_top_hit(
+    hybrid_searcher: HybridSearcher,
+    method_name: str,
+    result_type: str,
+    unpack,
+    expected_sources: set,
+):
+    """search returns RetrievalResult; search_raw the same ranking as (chunk, score) tuples."""
+    from src.rag import ChunkRecord
+
+    results = getattr(hybrid_searcher, method_name)("deadlock", top_k=2)
+
+    assert len(results) > 0
+    assert type(results[0]).__name__ == result_type
+    chunk, score, source = unpack(results[0])
+    assert isinstance(chunk, ChunkRecord)
+    assert chunk.id == "test_001"
+    assert isinstance(score, float)
+    assert score > 0
+    assert source in expected_sources
+
+
+def test_hybrid_searcher_with_config(
+    configured_hybrid_searcher: HybridSearcher, rag_config: RAGConfig
+):
+    """Test HybridSearcher with custom RAGConfig."""
+    from src.rag import RetrievalResult
+
+    results = configured_hybrid_searcher.search("deadlock")
+    
+    assert len(results) <= rag_config.top_k
+    assert all(isinstance(r, RetrievalResult) for r in results)
 
 
 def test_retrieval_result():
     """Test RetrievalResult dataclass."""
+    from src.rag import ChunkRecord, RetrievalResult
+
     chunk = ChunkRecord(
         id="test",
         book_id="book",
@@ -135,12 +218,12 @@ def test_retrieval_result():
     assert result.source == "hybrid"
 
 
-@pytest.mark.skipif(
-    True,
-    reason="chunks.jsonl integration test - enable when data is available",
-)
-def test_integration_with_real_data():
+@pytest.mark.slow
+@pytest.mark.integration
+def test_integration_with_real_data(embedding_backend: None):
     """Integration test with real chunks.jsonl if available."""
+    from src.rag import HybridSearcher, RetrievalResult, load_chunks
+
     try:
         chunks = load_chunks()
     except FileNotFoundError:
@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import datetime as dt
 
+import pytest
+
 from src.db.models import ReviewState
 from src.skills.scheduler import SM2Scheduler
 
+# The scheduler only holds its config; states are built fresh per test.
+SCHEDULER = SM2Scheduler()
+NOW = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+
 
 def _make_state() -> ReviewState:
     # Plain ORM instance detached from any session is fine for unit testing.
@@ -22,50 +28,26 @@ def _make_state() -> ReviewState:
     return state
 
 
-def test_sm2_first_success_review():
-    scheduler = SM2Scheduler()
-    state = _make_state()
-    now = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
-
-    updated = scheduler.compute_next(state, quality=5, now=now)
+# (qualities, expected repetitions, interval_days, lapses)
+CASES = [
+    pytest.param([5], 1, 1, 0, id="first_success"),
+    pytest.param([5, 5], 2, 6, 0, id="second_success"),
+    # A failed recall after two successes: proportional reset halves the interval (6 → 3)
+    pytest.param([5, 5, 1], 0, 3, 1, id="failure_after_two_successes"),
+]
 
-    assert updated.repetitions == 1
-    assert updated.interval_days == 1
-    assert updated.ease_factor > 2.5
-    assert updated.last_reviewed_at == now
-    assert updated.due_at == now + dt.timedelta(days=1)
-    assert updated.lapses == 0
 
-
-def test_sm2_second_success_review():
-    scheduler = SM2Scheduler()
+@pytest.mark.parametrize("qualities,reps,interval,lapses", CASES)
+def test_sm2_review_sequence(qualities: list[int], reps: int, interval: int, lapses: int):
     state = _make_state()
-    now = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
-
-    # First successful review
-    state = scheduler.compute_next(state, quality=5, now=now)
-    # Second successful review
-    updated = scheduler.compute_next(state, quality=5, now=now)
-
-    assert updated.repetitions == 2
-    assert updated.interval_days == 6
-    assert updated.ease_factor > 2.5
-    assert updated.due_at == now + dt.timedelta(days=6)
-
-
-def test_sm2_failed_review_increments_lapses_and_resets_interval():
-    scheduler = SM2Scheduler()
-    state = _make_state()
-    now = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
-
-    # Simulate a couple of successful reviews first
-    state = scheduler.compute_next(state, quality=5, now=now)
-    state = scheduler.compute_next(state, quality=5, now=now)
-
-    # Now a failed recall — proportional reset halves the interval (6 → 3)
-    updated = scheduler.compute_next(state, quality=1, now=now)
-
-    assert updated.repetitions == 0
-    assert updated.interval_days == 3
-    assert updated.lapses == 1
-    assert updated.due_at == now + dt.timedelta(days=3)
+    for quality in qualities:
+        state = SCHEDULER.compute_next(state, quality=quality, now=NOW)
+
+    assert state.repetitions == reps
+    assert state.interval_days == interval
+    assert state.lapses == lapses
+    assert state.last_reviewed_at == NOW
+    assert state.due_at == NOW + dt.timedelta(days=interval)
+    if lapses == 0:
+        # Only perfect recalls so far: EF has grown past its 2.5 start.
+        assert state.ease_factor > 2.5
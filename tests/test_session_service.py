@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import pytest
 from sqlalchemy import select
 from sqlalchemy.dialects import sqlite
 
 from src.db.models import Card, Topic
-from src.skills.session_service import QuizSessionService
+from src.skills.session_service import QuizSessionService, QuizSessionState
 
 
 def test_normalize_scope_values_lowercases_and_drops_blanks():
@@ -34,3 +35,52 @@ def test_session_scope_query_supports_subject_names_and_topic_keys():
 
     assert "topics.name IN ('os', 'os:deadlock')" in compiled
     assert "cards.topic_key IN ('os', 'os:deadlock')" in compiled
+
+
+def _session_state(card_ids: list[int]) -> QuizSessionState:
+    topic = Topic(id=1, name="os", description=None)
+    cards = {}
+    for card_id in card_ids:
+        card = Card(
+            id=card_id,
+            topic_id=1,
+            question=f"Q{card_id}",
+            answer=f"A{card_id}",
+            difficulty="medium",
+            question_type="definition",
+        )
+        card.topic = topic  # type: ignore[attr-defined]
+        cards[card_id] = card
+    return QuizSessionState(
+        session_id="s1",
+        user_id=1,
+        card_ids=card_ids,
+        cards_by_id=cards,
+        review_states_by_card={},
+    )
+
+
+# The router maps these ValueErrors to 400; no HTTP stack or DB is needed to
+# exercise them (a non-due current card is served without touching the DB).
+
+
+@pytest.mark.anyio
+async def test_submit_answer_rejects_completed_session():
+    with pytest.raises(ValueError, match="already complete"):
+        await QuizSessionService().submit_current_answer(
+            db=None,  # type: ignore[arg-type]
+            state=_session_state([]),
+            card_id=1,
+            user_answer="attempt",
+        )
+
+
+@pytest.mark.anyio
+async def test_submit_answer_rejects_card_that_is_not_current():
+    with pytest.raises(ValueError, match="does not match"):
+        await QuizSessionService().submit_current_answer(
+            db=None,  # type: ignore[arg-type]
+            state=_session_state([1, 2]),
+            card_id=999999,
+            user_answer="attempt",
+        )
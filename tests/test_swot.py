@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import datetime as dt
+from typing import Sequence
+
+import pytest
 
 from src.db.models import Card, ReviewAttempt, ReviewState, Topic
 from src.skills.swot import MasterySWOTEngine
@@ -59,51 +62,166 @@ def _attempt(*, user_id: int, card_id: int, quality: int, when: dt.datetime) ->
     )
 
 
-def test_swot_engine_flags_weakness_for_low_quality_with_overdue():
-    engine = MasterySWOTEngine()
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
-    topic = _topic("os", 1)
-    card = _card(1, topic, "os:deadlock")
-    states = [_state(user_id=1, card_id=1, due_at=now - dt.timedelta(days=2), lapses=2)]
-    attempts = [
-        _attempt(user_id=1, card_id=1, quality=1, when=now - dt.timedelta(days=4)),
-        _attempt(user_id=1, card_id=1, quality=2, when=now - dt.timedelta(days=3)),
-        _attempt(user_id=1, card_id=1, quality=1, when=now - dt.timedelta(days=1)),
+def _attempts_batch(
+    *,
+    user_id: int,
+    card_id: int,
+    qualities: Sequence[int],
+    days_ago: Sequence[int],
+    now: dt.datetime,
+) -> list[ReviewAttempt]:
+    """Build one card's attempts in a single pass (scales to large stress inputs)."""
+    return [
+        ReviewAttempt(
+            user_id=user_id,
+            card_id=card_id,
+            served_card_id=None,
+            attempted_at=now - dt.timedelta(days=int(days)),
+            quality=int(quality),
+            response_time_ms=900,
+        )
+        for quality, days in zip(qualities, days_ago)
     ]
 
-    mastery, swot = engine.compute(
+
+# One topic with a single card per scenario; attempts are (quality, days_ago).
+_SCENARIOS = [
+    pytest.param(
+        {
+            "subject": "os",
+            "topic_key": "os:deadlock",
+            "card_id": 1,
+            "due_in_days": -2,
+            "lapses": 2,
+            "attempts": [(1, 4), (2, 3), (1, 1)],
+            "mastery_range": (0, 50),
+            "buckets": {"weakness", "threat"},
+            "weakness_dominates": True,
+        },
+        id="weakness_for_low_quality_with_overdue",
+    ),
+    pytest.param(
+        {
+            "subject": "dbms",
+            "topic_key": "dbms:indexing",
+            "card_id": 11,
+            "due_in_days": 3,
+            "lapses": 0,
+            "attempts": [(5, 5), (5, 3), (4, 1)],
+            "mastery_range": (70, 100),
+            "buckets": {"strength"},
+            "weakness_dominates": False,
+        },
+        id="strength_for_high_quality_no_backlog",
+    ),
+]
+
+
+@pytest.fixture(scope="module", params=_SCENARIOS)
+def swot_scenario(request, clock):
+    """Build each scenario's ORM inputs and run the engine once per scenario."""
+    sc = request.param
+    card = _card(sc["card_id"], _topic(sc["subject"], 1), sc["topic_key"])
+    states = [
+        _state(
+            user_id=1,
+            card_id=sc["card_id"],
+            due_at=clock.now + dt.timedelta(days=sc["due_in_days"]),
+            lapses=sc["lapses"],
+        )
+    ]
+    qualities, days_ago = zip(*sc["attempts"])
+    attempts = _attempts_batch(
+        user_id=1,
+        card_id=sc["card_id"],
+        qualities=qualities,
+        days_ago=days_ago,
+        now=clock.now,
+    )
+    mastery, swot = MasterySWOTEngine().compute(
         cards=[card],
         review_states=states,
         review_attempts=attempts,
-        now=now,
+        now=clock.now,
     )
+    key = (sc["subject"], sc["topic_key"])
+    return sc, mastery[key], swot[key]
 
-    key = ("os", "os:deadlock")
-    assert mastery[key].mastery_score < 50
-    assert swot[key].primary_bucket in {"weakness", "threat"}
-    assert swot[key].weakness_score > swot[key].strength_score
+
+def test_swot_engine_scenario_buckets(swot_scenario):
+    sc, mastery, swot = swot_scenario
+    lo, hi = sc["mastery_range"]
+    assert lo < mastery.mastery_score < hi
+    assert swot.primary_bucket in sc["buckets"]
+    if sc["weakness_dominates"]:
+        assert swot.weakness_score > swot.strength_score
+    else:
+        assert swot.strength_score >= swot.weakness_score
 
 
-def test_swot_engine_flags_strength_for_high_quality_no_backlog():
+@pytest.mark.anyio
+async def test_swot_engine_stream_matches_compute(clock):
     engine = MasterySWOTEngine()
-    now = dt.datetime(2025, 1, 10, tzinfo=dt.timezone.utc)
-    topic = _topic("dbms", 1)
-    card = _card(11, topic, "dbms:indexing")
-    states = [_state(user_id=1, card_id=11, due_at=now + dt.timedelta(days=3), lapses=0)]
+    now = clock.now
+    topic = _topic("os", 1)
+    cards = [_card(1, topic, "os:deadlock"), _card(2, topic, "os:paging")]
+    states = [_state(user_id=1, card_id=1, due_at=clock.yesterday, lapses=1)]
     attempts = [
-        _attempt(user_id=1, card_id=11, quality=5, when=now - dt.timedelta(days=5)),
-        _attempt(user_id=1, card_id=11, quality=5, when=now - dt.timedelta(days=3)),
-        _attempt(user_id=1, card_id=11, quality=4, when=now - dt.timedelta(days=1)),
+        _attempt(user_id=1, card_id=card_id, quality=quality, when=now - dt.timedelta(days=days))
+        for card_id, quality, days in [(1, 5, 6), (2, 3, 5), (1, 1, 4), (1, 2, 2), (1, 4, 1)]
     ]
 
+    async def _stream():
+        for attempt in attempts:
+            yield attempt
+
+    expected = engine.compute(
+        cards=cards, review_states=states, review_attempts=attempts, now=now
+    )
+    streamed = await engine.compute_stream(
+        cards=cards, review_states=states, review_attempts=_stream(), now=now
+    )
+
+    assert streamed == expected
+    key = ("os", "os:deadlock")
+    assert streamed[0][key].attempt_count == 4
+    assert streamed[0][key].last_reviewed_at == clock.yesterday
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+@pytest.mark.anyio
+async def test_swot_repository_upserts_both_tables_in_one_statement(clock):
+    from sqlalchemy.dialects import postgresql
+
+    from src.skills.swot import MasterySWOTRepository
+
+    engine = MasterySWOTEngine()
+    now = clock.now
+    topic = _topic("os", 1)
+    cards = [_card(1, topic, "os:deadlock"), _card(2, topic, "os:paging")]
     mastery, swot = engine.compute(
-        cards=[card],
-        review_states=states,
-        review_attempts=attempts,
-        now=now,
+        cards=cards, review_states=[], review_attempts=[], now=now
+    )
+
+    db = _RecordingSession()
+    await MasterySWOTRepository().upsert(
+        db=db,  # type: ignore[arg-type]
+        user_id=1,
+        mastery=mastery,
+        swot=swot,
     )
 
-    key = ("dbms", "dbms:indexing")
-    assert mastery[key].mastery_score > 70
-    assert swot[key].strength_score >= swot[key].weakness_score
-    assert swot[key].primary_bucket == "strength"
+    assert len(db.statements) == 1
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH mastery_upsert AS")
+    assert "INSERT INTO user_topic_mastery" in sql
+    assert "INSERT INTO user_topic_swot" in sql
+    assert sql.count("ON CONFLICT (user_id, subject, topic_key) DO UPDATE") == 2
+    assert "created_at = excluded" not in sql
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from scripts.build_topic_dependency_graph import (
     PrereqEdge,
     _break_cycles,
@@ -64,3 +66,16 @@ def test_break_cycles_keeps_acyclic_graph_intact() -> None:
     acyclic, dropped = _break_cycles(edges)
     assert len(dropped) == 0
     assert len(acyclic) == 2
+
+
+@pytest.mark.parametrize("n", [10, 100, 1000])
+def test_break_cycles_scales_to_long_chains(n: int) -> None:
+    # t0 <- t1 <- ... <- t{n-1}, closed into one long cycle by a weak back-edge.
+    edges = [_edge(f"os:t{i + 1}", f"os:t{i}", 0.90) for i in range(n - 1)]
+    edges.append(_edge("os:t0", f"os:t{n - 1}", 0.10))
+
+    acyclic, dropped = _break_cycles(edges)
+    assert len(dropped) == 1
+    assert dropped[0]["topic_key"] == "os:t0"
+    assert dropped[0]["prerequisite_key"] == f"os:t{n - 1}"
+    assert len(acyclic) == n - 1
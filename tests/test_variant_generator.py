@@ -1,7 +1,18 @@
 from __future__ import annotations
 
+import datetime as dt
+import re
+from typing import Any
+
+import pytest
+
 from src.db.models import Card, Topic
-from src.skills.variant_generator import _extract_json_object, _valid_payload
+from src.skills.variant_generator import (
+    VariantGenerator,
+    _JSON_FENCE_RE,
+    _extract_json_object,
+    _valid_payload,
+)
 
 
 def _canonical_card() -> Card:
@@ -23,6 +34,67 @@ def _canonical_card() -> Card:
     return card
 
 
+def _variant(id_: int, canonical: Card) -> Card:
+    card = Card(
+        id=id_,
+        topic_id=canonical.topic_id,
+        question=f"Variant {id_}",
+        answer="A",
+        difficulty="medium",
+        question_type="definition",
+        topic_key=canonical.topic_key,
+        variant_of_card_id=canonical.id,
+        generation_origin="runtime_variant",
+    )
+    card.topic = canonical.topic  # type: ignore[attr-defined]
+    return card
+
+
+class _FakeResult:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+
+    def scalars(self) -> "_FakeResult":
+        return self
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, *results: list[Any]):
+        self._results = list(results)
+
+    async def execute(self, _query: Any) -> _FakeResult:
+        return _FakeResult(self._results.pop(0))
+
+
+async def _select(variants: list[Card], seen: list[tuple[int, dt.datetime]]) -> Card:
+    canonical = _canonical_card()
+    db = _FakeSession(variants, seen)
+    return await VariantGenerator().select_or_create_variant(
+        db=db,  # type: ignore[arg-type]
+        user_id=1,
+        canonical_card=canonical,
+    )
+
+
+@pytest.mark.anyio
+async def test_select_variant_prefers_unseen_variant(clock):
+    canonical = _canonical_card()
+    variants = [_variant(10, canonical), _variant(11, canonical), _variant(12, canonical)]
+    chosen = await _select(variants, [(10, clock.now), (12, clock.yesterday)])
+    assert chosen.id == 11
+
+
+@pytest.mark.anyio
+async def test_select_variant_falls_back_to_least_recently_seen(clock):
+    canonical = _canonical_card()
+    variants = [_variant(10, canonical), _variant(11, canonical)]
+    chosen = await _select(variants, [(10, clock.now), (11, clock.two_days_ago)])
+    assert chosen.id == 11
+
+
 def test_extract_json_object_from_fenced_content():
     raw = """```json
 {
@@ -37,6 +109,25 @@ def test_extract_json_object_from_fenced_content():
     assert parsed["question_type"] == "procedural"
 
 
+def test_json_fence_pattern_is_precompiled_with_dotall():
+    # Extraction runs on every LLM response; the fence pattern must stay a
+    # module-level compiled constant that spans newlines.
+    assert isinstance(_JSON_FENCE_RE, re.Pattern)
+    assert _JSON_FENCE_RE.flags & re.DOTALL
+
+
+def test_extract_json_object_from_prose_wrapped_content():
+    raw = (
+        'Sure! Here is the variant: {"query": "Why does {} matter?", '
+        '"answer": "It is an empty set.", "question_type": "factual", '
+        '"difficulty": "easy"} Let me know if you need more {details}.'
+    )
+    parsed = _extract_json_object(raw)
+    assert parsed is not None
+    assert parsed["query"] == "Why does {} matter?"
+    assert parsed["difficulty"] == "easy"
+
+
 def test_valid_payload_rejects_same_question_text():
     canonical = _canonical_card()
     payload = {